@@ -14,7 +14,7 @@ backlog = 2048
 
 # Worker processes
 workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
-worker_class = "sync"
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', "gevent")
 worker_connections = 1000
 timeout = 60
 keepalive = 2
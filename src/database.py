@@ -8,7 +8,7 @@ Integração com Supabase PostgreSQL e salvamento local
 import os
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator
 from services.supabase_client import supabase_client
 from services.local_file_manager import local_file_manager
 import json
@@ -92,6 +92,22 @@ class DatabaseManager:
         """Lista análises com paginação"""
         return self.supabase.list_analyses(limit, offset)
     
+    def list_analyses_iter(self, limit: int = 50, offset: int = 0, page_size: int = 20) -> Iterator[Dict[str, Any]]:
+        """Itera análises página a página, sem materializar a lista completa"""
+        remaining = limit
+        while remaining > 0:
+            batch_size = min(page_size, remaining)
+            page = self.supabase.list_analyses(batch_size, offset)
+            if not page:
+                return
+            
+            yield from page
+            
+            if len(page) < batch_size:
+                return
+            remaining -= len(page)
+            offset += len(page)
+    
     def delete_analysis(self, analysis_id: int) -> bool:
         """Remove análise do banco"""
         # Remove do Supabase
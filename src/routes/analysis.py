@@ -8,9 +8,11 @@ Endpoints para análise de mercado ultra-detalhada
 import os
 import logging
 import time
-import json
 from datetime import datetime
-from flask import Blueprint, request, jsonify, session
+from typing import Annotated, Iterable
+import msgspec
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
+from flask import Blueprint, Response, current_app, request, jsonify, session, stream_with_context
 from services.enhanced_analysis_engine import enhanced_analysis_engine
 from services.ultra_detailed_analysis_engine import ultra_detailed_analysis_engine
 from services.ai_manager import ai_manager
@@ -21,12 +23,72 @@ from services.attachment_service import attachment_service
 from database import db_manager
 from routes.progress import get_progress_tracker, update_analysis_progress
 from services.auto_save_manager import auto_save_manager, salvar_etapa, salvar_erro
+from utils.time_utils import now_iso
+from utils.http_cache import compute_etag, etag_json_response
+from services.search_cache import search_cache, analysis_cache, analysis_cache_key
+from services.task_queue import task_queue
+from services.system_status import (
+    get_ai_status, get_search_status, invalidate_status_cache,
+    collect_system_status, collect_system_stats
+)
 
 logger = logging.getLogger(__name__)
 
 # Cria blueprint
 analysis_bp = Blueprint('analysis', __name__)
 
+@analysis_bp.before_request
+def _reject_oversized_body():
+    """Rejeita corpo acima de MAX_CONTENT_LENGTH antes da rota (413 pelo handler da aplicação)"""
+    max_length = request.max_content_length
+    if max_length is not None and (request.content_length or 0) > max_length:
+        raise RequestEntityTooLarge()
+
+# Schemas de requisição (decodificados e validados com msgspec)
+NonEmptyStr = Annotated[str, msgspec.Meta(min_length=1)]
+
+class AnalyzeSimpleRequest(msgspec.Struct):
+    segmento: NonEmptyStr
+    produto: NonEmptyStr
+    publico: NonEmptyStr
+
+class TestSearchRequest(msgspec.Struct):
+    query: str = 'teste mercado digital Brasil'
+    max_results: int = 5
+
+class TestAIRequest(msgspec.Struct):
+    prompt: str = 'Gere um breve resumo sobre o mercado digital brasileiro em 2024.'
+
+# Decoders reutilizáveis (thread-safe)
+_object_decoder = msgspec.json.Decoder(dict)
+_test_search_decoder = msgspec.json.Decoder(TestSearchRequest, strict=False)
+_test_ai_decoder = msgspec.json.Decoder(TestAIRequest)
+
+def _decode_body(decoder: msgspec.json.Decoder):
+    """Decodifica o corpo JSON da requisição; retorna (dados, resposta_de_erro)"""
+    try:
+        return decoder.decode(request.get_data(cache=False) or b'{}'), None
+    except msgspec.DecodeError as e:  # inclui ValidationError
+        return None, (jsonify({
+            'success': False,
+            'error': 'Dados inválidos',
+            'message': str(e)
+        }), 400)
+
+def _wants_stream() -> bool:
+    """Verifica se o cliente pediu resposta em streaming (?stream=1)"""
+    return request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+def _ndjson_response(rows: Iterable) -> Response:
+    """Resposta NDJSON: um objeto JSON por linha, serializado sob demanda"""
+    json_provider = current_app.json
+    
+    def generate():
+        for row in rows:
+            yield json_provider.dumps(row) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @analysis_bp.route('/analyze', methods=['POST'])
 def analyze_market():
     """Endpoint principal para análise de mercado"""
@@ -287,24 +349,18 @@ def get_analysis_status():
     """Retorna status dos sistemas de análise"""
     
     try:
-        # Status dos provedores de IA
-        ai_status = ai_manager.get_provider_status()
-        
-        # Status dos provedores de busca
-        search_status = production_search_manager.get_provider_status()
-        
-        # Status do banco de dados
-        db_status = db_manager.test_connection()
+        # Status de IA, busca e banco em paralelo
+        ai_status, search_status, db_status = collect_system_status()
         
         # Status geral
-        total_ai_available = len([p for p in ai_status.values() if p['available']])
-        total_search_available = len([p for p in search_status.values() if p['available']])
+        total_ai_available = sum(1 for p in ai_status.values() if p['available'])
+        total_search_available = sum(1 for p in search_status.values() if p['available'])
         
         overall_status = "healthy" if (total_ai_available > 0 and total_search_available > 0 and db_status) else "degraded"
         
         return jsonify({
             'status': overall_status,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now_iso(),
             'systems': {
                 'ai_providers': {
                     'status': 'healthy' if total_ai_available > 0 else 'error',
@@ -341,7 +397,7 @@ def get_analysis_status():
         return jsonify({
             'status': 'error',
             'message': str(e),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }), 500
 
 @analysis_bp.route('/reset_providers', methods=['POST'])
@@ -367,12 +423,15 @@ def reset_providers():
         
         logger.info(f"🔄 {message}")
         
+        # Status em cache não reflete mais o estado dos provedores
+        invalidate_status_cache()
+        
         return jsonify({
             'success': True,
             'message': message,
-            'ai_status': ai_manager.get_provider_status(),
-            'search_status': production_search_manager.get_provider_status(),
-            'timestamp': datetime.now().isoformat()
+            'ai_status': get_ai_status(),
+            'search_status': get_search_status(),
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -387,24 +446,34 @@ def test_search():
     """Testa sistema de busca"""
     
     try:
-        data = request.get_json()
-        query = data.get('query', 'teste mercado digital Brasil')
-        max_results = min(int(data.get('max_results', 5)), 10)
+        req, error_response = _decode_body(_test_search_decoder)
+        if error_response:
+            return error_response
+        
+        query = req.query
+        max_results = min(req.max_results, 10)
         
-        logger.info(f"🧪 Testando busca: {query}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"🧪 Testando busca: {query}")
         
         # Testa busca
         results = production_search_manager.search_with_fallback(query, max_results)
         
+        if _wants_stream():
+            return _ndjson_response(results)
+        
         return jsonify({
             'success': True,
             'query': query,
             'results_count': len(results),
             'results': results,
             'provider_status': production_search_manager.get_provider_status(),
-            'timestamp': datetime.now().isoformat()
+            'cache_stats': search_cache.get_stats(),
+            'timestamp': now_iso()
         })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erro no teste de busca: {str(e)}")
         return jsonify({
@@ -420,7 +489,8 @@ def test_extraction():
         data = request.get_json()
         test_url = data.get('url', 'https://g1.globo.com/tecnologia/')
         
-        logger.info(f"🧪 Testando extração: {test_url}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"🧪 Testando extração: {test_url}")
         
         # Testa extração segura
         extraction_result = safe_content_extractor.safe_extract_content(test_url)
@@ -434,7 +504,7 @@ def test_extraction():
                 'validation': extraction_result['validation'],
                 'metadata': extraction_result['metadata'],
                 'extractor_stats': safe_content_extractor.get_extraction_stats(),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             })
         else:
             return jsonify({
@@ -443,7 +513,7 @@ def test_extraction():
                 'error': extraction_result['error'],
                 'metadata': extraction_result['metadata'],
                 'extractor_stats': safe_content_extractor.get_extraction_stats(),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             })
         
     except Exception as e:
@@ -460,10 +530,9 @@ def get_extractor_stats():
     try:
         stats = safe_content_extractor.get_extraction_stats()
         
-        return jsonify({
+        return etag_json_response({
             'success': True,
-            'stats': stats,
-            'timestamp': datetime.now().isoformat()
+            'stats': stats
         })
         
     except Exception as e:
@@ -491,7 +560,7 @@ def reset_extractors():
             'success': True,
             'message': message,
             'stats': safe_content_extractor.get_extraction_stats(),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
     except Exception as e:
@@ -506,7 +575,9 @@ def validate_analysis():
     """Valida qualidade de uma análise"""
     
     try:
-        data = request.get_json()
+        data, error_response = _decode_body(_object_decoder)
+        if error_response:
+            return error_response
         
         if not data:
             return jsonify({
@@ -517,9 +588,11 @@ def validate_analysis():
             'validation': {'valid': True, 'message': 'Validação simplificada'},
             'quality_report': 'Análise válida para processamento',
             'can_generate_pdf': True,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erro na validação: {str(e)}")
         return jsonify({
@@ -532,20 +605,46 @@ def analyze_simple():
     """Endpoint alternativo mais simples para análise"""
     
     try:
-        data = request.get_json()
+        data, error_response = _decode_body(_object_decoder)
+        if error_response:
+            return error_response
         
         # Validar dados obrigatórios
-        required_fields = ['segmento', 'produto', 'publico']
-        missing_fields = [field for field in required_fields if not data.get(field)]
-        
-        if missing_fields:
+        try:
+            msgspec.convert(data, AnalyzeSimpleRequest)
+        except msgspec.ValidationError as e:
+            missing_fields = [field for field in AnalyzeSimpleRequest.__struct_fields__ if not data.get(field)]
             return jsonify({
                 'success': False,
-                'error': f'Campos obrigatórios: {", ".join(missing_fields)}'
+                'error': f'Campos obrigatórios: {", ".join(missing_fields)}' if missing_fields else f'Dados inválidos: {e}'
             }), 400
         
         logger.info(f"🚀 Iniciando análise: {data.get('segmento')} - {data.get('produto')}")
         
+        # Verifica cache de análises idênticas
+        cache_key = analysis_cache_key(data)
+        analysis_result = analysis_cache.get(cache_key)
+        
+        if analysis_result is not None:
+            logger.info("🔄 Análise retornada do cache")
+            return jsonify({
+                'success': True,
+                'analysis': analysis_result,
+                'cached': True,
+                'timestamp': datetime.now().isoformat()
+            })
+        
+        # Com fila configurada, a análise roda em um worker RQ e o cliente consulta o job
+        job_id = task_queue.enqueue_analysis(data)
+        if job_id:
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f'/api/progress/job/{job_id}',
+                'timestamp': now_iso()
+            }), 202
+
         # Usar o engine de análise existente
         from services.enhanced_analysis_engine import enhanced_analysis_engine
         
@@ -558,12 +657,17 @@ def analyze_simple():
                 'error': 'Falha na geração da análise'
             }), 500
         
+        analysis_cache.set(cache_key, analysis_result)
+        
         return jsonify({
             'success': True,
             'analysis': analysis_result,
+            'cached': False,
             'timestamp': datetime.now().isoformat()
         })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erro na análise: {str(e)}")
         return jsonify({
@@ -576,8 +680,11 @@ def test_ai():
     """Testa sistema de IA"""
     
     try:
-        data = request.get_json()
-        prompt = data.get('prompt', 'Gere um breve resumo sobre o mercado digital brasileiro em 2024.')
+        req, error_response = _decode_body(_test_ai_decoder)
+        if error_response:
+            return error_response
+        
+        prompt = req.prompt
         
         logger.info("🧪 Testando sistema de IA...")
         
@@ -590,9 +697,11 @@ def test_ai():
             'response': response,
             'response_length': len(response) if response else 0,
             'provider_status': ai_manager.get_provider_status(),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erro no teste de IA: {str(e)}")
         return jsonify({
@@ -625,6 +734,8 @@ def upload_attachment():
         
         return jsonify(result)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erro no upload de anexo: {str(e)}")
         return jsonify({
@@ -638,19 +749,29 @@ def list_analyses():
     """Lista análises salvas"""
     
     try:
-        limit = min(int(request.args.get('limit', 20)), 100)
+        stream = _wants_stream()
+        limit = min(int(request.args.get('limit', 20)), 1000 if stream else 100)
         offset = int(request.args.get('offset', 0))
         
+        if stream:
+            return _ndjson_response(db_manager.list_analyses_iter(limit, offset))
+        
         analyses = db_manager.list_analyses(limit, offset)
         
-        return jsonify({
+        # ETag derivado de ids + último updated_at, sem serializar a lista inteira
+        etag = compute_etag((
+            limit, offset, len(analyses),
+            max((a.get('updated_at') or a.get('created_at') or '' for a in analyses), default=''),
+            [a.get('id') for a in analyses]
+        ))
+        
+        return etag_json_response({
             'success': True,
             'analyses': analyses,
             'count': len(analyses),
             'limit': limit,
-            'offset': offset,
-            'timestamp': datetime.now().isoformat()
-        })
+            'offset': offset
+        }, etag=etag)
         
     except Exception as e:
         logger.error(f"Erro ao listar análises: {str(e)}")
@@ -667,10 +788,9 @@ def get_analysis(analysis_id):
         analysis = db_manager.get_analysis(analysis_id)
         
         if analysis:
-            return jsonify({
+            return etag_json_response({
                 'success': True,
-                'analysis': analysis,
-                'timestamp': datetime.now().isoformat()
+                'analysis': analysis
             })
         else:
             return jsonify({
@@ -690,20 +810,17 @@ def get_stats():
     """Obtém estatísticas do sistema"""
     
     try:
-        db_stats = db_manager.get_stats()
-        ai_status = ai_manager.get_provider_status()
-        search_status = production_search_manager.get_provider_status()
+        db_stats, ai_status, search_status, db_connected = collect_system_stats()
         
-        return jsonify({
+        return etag_json_response({
             'database_stats': db_stats,
             'ai_providers': ai_status,
             'search_providers': search_status,
             'system_health': {
-                'ai_available': len([p for p in ai_status.values() if p['available']]),
-                'search_available': len([p for p in search_status.values() if p['available']]),
-                'database_connected': db_manager.test_connection()
-            },
-            'timestamp': datetime.now().isoformat()
+                'ai_available': sum(1 for p in ai_status.values() if p['available']),
+                'search_available': sum(1 for p in search_status.values() if p['available']),
+                'database_connected': db_connected
+            }
         })
         
     except Exception as e:
@@ -362,6 +362,7 @@ import logging
 from flask import Blueprint, request, jsonify, session
 from datetime import datetime
 import uuid
+from services.task_queue import task_queue
 
 logger = logging.getLogger(__name__)
 
@@ -507,3 +508,27 @@ def complete_progress():
             'success': False,
             'error': str(e)
         }), 500
+
+@progress_bp.route('/progress/job/<job_id>', methods=['GET'])
+def get_job_progress(job_id):
+    """Obtém status de uma análise enfileirada no RQ"""
+    try:
+        job_status = task_queue.get_job_status(job_id)
+        
+        if job_status is None:
+            return jsonify({
+                'success': False,
+                'error': 'Job não encontrado'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'data': job_status
+        })
+        
+    except Exception as e:
+        logger.error(f"Erro ao obter status do job: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -10,7 +10,7 @@ import logging
 import time
 import json
 from typing import Dict, List, Optional, Any
-import requests
+from services.http_session import SESSION
 
 # Imports condicionais para os clientes de IA
 try:
@@ -353,7 +353,7 @@ class AIManager:
                 url = f"{config['client']['base_url']}{model}"
                 headers = {"Authorization": f"Bearer {config['client']['api_key']}"}
                 payload = {"inputs": prompt, "parameters": {"max_new_tokens": min(max_tokens, 1024)}}
-                response = requests.post(url, headers=headers, json=payload, timeout=60)
+                response = SESSION.post(url, headers=headers, json=payload, timeout=60)
                 
                 if response.status_code == 200:
                     res_json = response.json()
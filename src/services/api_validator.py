@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - API Validator
+Validação das APIs externas (IA, busca, banco) usadas pelo sistema
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import functools
+import textwrap
+import threading
+import weakref
+import contextlib
+from datetime import datetime
+from dataclasses import dataclass
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+
+# Imports condicionais dos SDKs validados
+try:
+    import google.generativeai as genai
+    from google.generativeai.client import get_default_model_client
+    HAS_GEMINI = True
+except ImportError:
+    HAS_GEMINI = False
+
+try:
+    from groq import Groq
+    HAS_GROQ = True
+except ImportError:
+    HAS_GROQ = False
+
+try:
+    import openai
+    HAS_OPENAI = True
+except ImportError:
+    HAS_OPENAI = False
+
+# Import condicional do aiohttp (variante assíncrona)
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+logger = logging.getLogger(__name__)
+
+# Prioridades das APIs
+CRITICAL = 'CRITICAL'
+RECOMMENDED = 'RECOMMENDED'
+OPTIONAL = 'OPTIONAL'
+
+# Timeouts das sondas: conexão curta (host inacessível falha rápido), leitura mais longa
+PROBE_CONNECT_TIMEOUT = float(os.getenv('API_PROBE_CONNECT_TIMEOUT', 2.0))
+PROBE_READ_TIMEOUT = float(os.getenv('API_PROBE_READ_TIMEOUT', 8.0))
+PROBE_TIMEOUT = (PROBE_CONNECT_TIMEOUT, PROBE_READ_TIMEOUT)
+
+try:
+    import httpx
+    SDK_TIMEOUT = httpx.Timeout(PROBE_READ_TIMEOUT, connect=PROBE_CONNECT_TIMEOUT)
+except ImportError:
+    SDK_TIMEOUT = PROBE_READ_TIMEOUT
+
+# Adapter próprio das sondas, sem retries: o adapter compartilhado (Retry total=2)
+# multiplicaria o timeout de conexão e anularia a falha rápida
+PROBE_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0)
+
+def build_probe_session() -> requests.Session:
+    """Sessão keep-alive sobre o adapter das sondas (sem retries)"""
+    session = requests.Session()
+    session.mount('https://', PROBE_ADAPTER)
+    session.mount('http://', PROBE_ADAPTER)
+    session.headers['User-Agent'] = 'ARQV30-APIValidator/2.0'
+    return session
+
+# Instância global
+SESSION = build_probe_session()
+
+# Validações reaproveitadas por este tempo (segundos) para poupar cotas das APIs pagas
+API_VALIDATION_TTL = float(os.getenv('API_VALIDATION_TTL', 300))
+
+_HTTP_METHODS = {'http_get': 'GET', 'http_post': 'POST', 'http_head': 'HEAD'}
+
+class _ProbeResponse:
+    """Resposta mínima (status + bytes) compatível com os success_predicate das sondas"""
+
+    __slots__ = ('status_code', 'content')
+
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.content = content
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+@dataclass(frozen=True, slots=True)
+class APIProbe:
+    """Definição declarativa de uma sonda de API"""
+    name: str
+    priority: str
+    env_keys: Tuple[str, ...]
+    kind: str  # 'http_get' | 'http_post' | 'http_head' | 'sdk'
+    url: str = ''  # pode referenciar variáveis: '{SUPABASE_URL}/rest/v1/...'
+    build_request: Optional[Callable[[Dict[str, str]], Dict[str, Any]]] = None  # env -> kwargs do request
+    success_predicate: Optional[Callable[[requests.Response], bool]] = None
+    ok_statuses: Tuple[int, ...] = (200,)
+    check: Optional[Callable[..., Tuple[bool, str]]] = None  # sondas 'sdk': (validator, env) -> (working, details)
+    library: str = ''
+    library_available: bool = True
+
+def _probe_url(probe: APIProbe, env: Dict[str, str]) -> str:
+    """URL da sonda com as variáveis de ambiente aplicadas"""
+    return probe.url.format(**{key: value.rstrip('/') for key, value in env.items()})
+
+def _probe_succeeded(probe: APIProbe, response) -> bool:
+    """Status aceito e, se houver, predicado de sucesso satisfeito"""
+    if response.status_code not in probe.ok_statuses:
+        return False
+    return probe.success_predicate is None or probe.success_predicate(response)
+
+class APIValidator:
+    """Validador das APIs externas configuradas"""
+
+    __slots__ = ('validation_results', 'last_validation', '_ttl', '_api_cache', '_client_cache', '_aio_sessions')
+
+    def __init__(self):
+        """Inicializa o validador"""
+        self.validation_results = {}
+        self.last_validation = None
+        self._ttl = API_VALIDATION_TTL
+        self._api_cache = {}  # api_name -> (timestamp, (configured, working, details))
+        self._aio_sessions = weakref.WeakKeyDictionary()  # event loop -> aiohttp.ClientSession
+        self._client_cache: Dict[str, Tuple[str, Any]] = {}  # api_name -> (api_key, client)
+
+    def _get_client(self, api_name: str, api_key: str, builder) -> Any:
+        """Retorna cliente SDK em cache (reconstrói apenas se a chave mudar)"""
+        cached = self._client_cache.get(api_name)
+        if cached and cached[0] == api_key:
+            return cached[1]
+
+        client = builder()
+        self._client_cache[api_name] = (api_key, client)
+        return client
+
+    def _is_fresh(self, timestamp) -> bool:
+        """Verifica se uma validação ainda está dentro do TTL"""
+        return bool(timestamp) and (time.time() - timestamp) < self._ttl
+
+    def validate_all_apis(self, force: bool = False, only_failed: bool = False, verbose: bool = False,
+                          executor: Optional[Executor] = None,
+                          session: Optional[requests.Session] = None) -> Dict[str, Any]:
+        """Valida todas as APIs em paralelo (latência = API mais lenta, não a soma)
+
+        Dentro do TTL retorna o resultado anterior, exceto com force=True.
+        Com only_failed=True revalida apenas as APIs que falharam, reaproveitando as saudáveis.
+        Com verbose=True imprime o relatório uma única vez, ao final.
+        Com executor, as sondas usam esse pool (que não é encerrado) em vez de um pool próprio.
+        Com session, as sondas HTTP usam essa sessão em vez da SESSION do módulo.
+        """
+        if not force and not only_failed and self._is_fresh(self.last_validation):
+            if verbose:
+                print(self.format_report(self.validation_results))
+            return self.validation_results
+
+        logger.info("🔍 Validando APIs externas...")
+
+        results = self._new_results()
+        lock = threading.Lock()
+        start_time = time.time()
+
+        pending = []
+        for probe in self._dispatchable_probes(results):
+            cached = self._api_cache.get(probe.name)
+            if only_failed and not force and cached and cached[1][1] and self._is_fresh(cached[0]):
+                self._record(results, probe, cached[1])
+            else:
+                pending.append(probe)
+
+        if pending:
+            pool = (
+                ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix='api_validator')
+                if executor is None else contextlib.nullcontext(executor)
+            )
+            with pool as probe_executor:
+                futures = {probe_executor.submit(self._run_probe, probe, session): probe for probe in pending}
+
+                for future in as_completed(futures):
+                    probe = futures[future]
+                    result = future.result()
+                    self._api_cache[probe.name] = (time.time(), result)
+                    with lock:
+                        self._record(results, probe, result)
+
+        return self._finish(results, start_time, verbose)
+
+    async def validate_all_apis_async(self, force: bool = False, verbose: bool = False) -> Dict[str, Any]:
+        """Variante assíncrona: sondas HTTP com aiohttp, chamadas de SDK em executor"""
+        if not force and self._is_fresh(self.last_validation):
+            if verbose:
+                print(self.format_report(self.validation_results))
+            return self.validation_results
+
+        loop = asyncio.get_running_loop()
+
+        if not HAS_AIOHTTP:
+            return await loop.run_in_executor(
+                None, functools.partial(self.validate_all_apis, force=True, verbose=verbose)
+            )
+
+        logger.info("🔍 Validando APIs externas (async)...")
+
+        results = self._new_results()
+        start_time = time.time()
+
+        probes = self._dispatchable_probes(results)
+        session = self._get_aio_session(loop)
+
+        outcomes = await asyncio.gather(*(
+            loop.run_in_executor(None, self._run_probe, probe) if probe.kind == 'sdk'
+            else self._run_probe_async(session, probe)
+            for probe in probes
+        ), return_exceptions=True)
+
+        for probe, outcome in zip(probes, outcomes):
+            if isinstance(outcome, BaseException):
+                outcome = (False, False, f"Erro na validação: {str(outcome)}")
+            self._api_cache[probe.name] = (time.time(), outcome)
+            self._record(results, probe, outcome)
+
+        return self._finish(results, start_time, verbose)
+
+    def _get_aio_session(self, loop: asyncio.AbstractEventLoop) -> 'aiohttp.ClientSession':
+        """Sessão aiohttp do event loop, criada no primeiro uso e reaproveitada (cache DNS e conexões TLS)"""
+        session = self._aio_sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(connect=PROBE_CONNECT_TIMEOUT, sock_read=PROBE_READ_TIMEOUT),
+                headers={'User-Agent': SESSION.headers['User-Agent']}
+            )
+            self._aio_sessions[loop] = session
+        return session
+
+    async def aclose(self):
+        """Fecha a sessão aiohttp do event loop atual (chamar no encerramento da aplicação)"""
+        session = self._aio_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _dispatchable_probes(self, results: Dict[str, Any]) -> List[APIProbe]:
+        """Registra direto as sondas sem chave/biblioteca e retorna só as que precisam de rede"""
+        dispatchable = []
+        for probe in PROBES:
+            _, early_result = self._prepare_probe(probe)
+            if early_result:
+                self._api_cache[probe.name] = (time.time(), early_result)
+                self._record(results, probe, early_result)
+            else:
+                dispatchable.append(probe)
+        return dispatchable
+
+    def _new_results(self) -> Dict[str, Any]:
+        """Estrutura vazia de resultados de validação"""
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'apis': {},
+            'summary': {
+                'total': len(PROBES),
+                'configured': 0,
+                'working': 0,
+                'critical_failures': []
+            }
+        }
+
+    def _record(self, results: Dict[str, Any], probe: APIProbe, result: Tuple[bool, bool, str]):
+        """Registra o resultado de uma sonda e atualiza o resumo"""
+        configured, working, details = result
+
+        results['apis'][probe.name] = {
+            'configured': configured,
+            'working': working,
+            'details': details,
+            'priority': probe.priority
+        }
+        if configured:
+            results['summary']['configured'] += 1
+        if working:
+            results['summary']['working'] += 1
+        elif probe.priority == CRITICAL:
+            results['summary']['critical_failures'].append(probe.name)
+
+        logger.debug(f"{probe.name}: configured={configured} working={working} - {details}")
+
+    def _finish(self, results: Dict[str, Any], start_time: float, verbose: bool) -> Dict[str, Any]:
+        """Finaliza a validação: duração, cache do resultado e relatório"""
+        results['summary']['duration'] = time.time() - start_time
+
+        self.validation_results = results
+        self.last_validation = time.time()
+
+        summary = results['summary']
+        logger.info(f"📊 APIs funcionando: {summary['working']}/{summary['total']} em {summary['duration']:.2f}s")
+
+        if verbose:
+            print(self.format_report(results))
+
+        return results
+
+    @staticmethod
+    def format_report(results: Dict[str, Any]) -> str:
+        """Monta o relatório de validação (uma linha por API, na ordem de PROBES)"""
+        lines = []
+        for probe in PROBES:
+            api = results.get('apis', {}).get(probe.name)
+            if not api:
+                continue
+            status_icon = "✅" if api['working'] else ("⚠️" if api['configured'] else "❌")
+            lines.append(f"{status_icon} {probe.name.upper()}: {api['details']}")
+
+        return "\n🔍 VALIDAÇÃO DE APIs\n" + textwrap.indent("\n".join(lines), '   ')
+
+    def _run_probe(self, probe: APIProbe, session: Optional[requests.Session] = None) -> Tuple[bool, bool, str]:
+        """Executa uma sonda: checa configuração, depois a requisição HTTP ou a chamada ao SDK"""
+        env, early_result = self._prepare_probe(probe)
+        if early_result:
+            return early_result
+
+        try:
+            if probe.kind == 'sdk':
+                working, details = probe.check(self, env)
+                return True, working, details
+
+            response = (session or SESSION).request(
+                _HTTP_METHODS[probe.kind], _probe_url(probe, env),
+                timeout=PROBE_TIMEOUT, **probe.build_request(env)
+            )
+
+            if _probe_succeeded(probe, response):
+                return True, True, "API funcionando"
+            return True, False, f"HTTP {response.status_code}"
+
+        except Exception as e:
+            return True, False, f"Erro: {str(e)[:100]}"
+
+    async def _run_probe_async(self, session: 'aiohttp.ClientSession', probe: APIProbe) -> Tuple[bool, bool, str]:
+        """Executa uma sonda HTTP com aiohttp (mesmas regras de _run_probe)"""
+        env, early_result = self._prepare_probe(probe)
+        if early_result:
+            return early_result
+
+        try:
+            async with session.request(
+                _HTTP_METHODS[probe.kind], _probe_url(probe, env), **probe.build_request(env)
+            ) as response:
+                probe_response = _ProbeResponse(response.status, await response.read())
+
+            if _probe_succeeded(probe, probe_response):
+                return True, True, "API funcionando"
+            return True, False, f"HTTP {probe_response.status_code}"
+
+        except Exception as e:
+            return True, False, f"Erro: {str(e)[:100] or type(e).__name__}"
+
+    def _prepare_probe(self, probe: APIProbe) -> Tuple[Dict[str, str], Optional[Tuple[bool, bool, str]]]:
+        """Lê as variáveis da sonda; retorna resultado antecipado se não configurada"""
+        env = {key: os.getenv(key) for key in probe.env_keys}
+
+        if not all(env.values()):
+            suffix = "configurada" if len(probe.env_keys) == 1 else "configurados"
+            return env, (False, False, f"{'/'.join(probe.env_keys)} não {suffix}")
+
+        if not probe.library_available:
+            return env, (True, False, f"Biblioteca {probe.library} não instalada")
+
+        return env, None
+
+    def _check_gemini(self, env: Dict[str, str]) -> Tuple[bool, str]:
+        """Valida chave do Gemini"""
+        api_key = env['GEMINI_API_KEY']
+        # Configura o SDK uma vez por chave (o modelo só é criado no fallback)
+        self._get_client('gemini', api_key, lambda: genai.configure(api_key=api_key))
+
+        # Listagem de modelos é gratuita e rápida; chamada direta ao cliente gRPC porque
+        # genai.list_models() não aceita prazo (o retry padrão chega a 60s sem rede)
+        if hasattr(genai, 'list_models'):
+            models = get_default_model_client().list_models(page_size=1, retry=None, timeout=PROBE_READ_TIMEOUT)
+            if next(iter(models), None) is not None:
+                return True, "API funcionando"
+            return False, "Nenhum modelo disponível"
+
+        model = self._get_client('gemini_model', api_key, lambda: genai.GenerativeModel('gemini-2.0-flash-exp'))
+        response = model.generate_content("Responda apenas: GEMINI_OK")
+
+        if "GEMINI_OK" in response.text:
+            return True, "API funcionando"
+        return False, "Resposta inesperada"
+
+    def _check_groq(self, env: Dict[str, str]) -> Tuple[bool, str]:
+        """Valida chave do Groq"""
+        api_key = env['GROQ_API_KEY']
+        client = self._get_client('groq', api_key, lambda: Groq(api_key=api_key, timeout=SDK_TIMEOUT))
+
+        # Modelo menor e 1 token: basta confirmar que a chave é aceita
+        response = client.chat.completions.create(
+            model='llama-3.1-8b-instant',
+            messages=[{'role': 'user', 'content': 'Responda apenas: GROQ_OK'}],
+            max_tokens=1
+        )
+
+        if response.choices:
+            return True, "API funcionando"
+        return False, "Resposta inesperada"
+
+    def _check_openai(self, env: Dict[str, str]) -> Tuple[bool, str]:
+        """Valida chave da OpenAI"""
+        api_key = env['OPENAI_API_KEY']
+        client = self._get_client('openai', api_key, lambda: openai.OpenAI(api_key=api_key, timeout=SDK_TIMEOUT))
+
+        # Listagem de modelos não consome tokens
+        if next(iter(client.models.list()), None) is not None:
+            return True, "API funcionando"
+        return False, "Nenhum modelo disponível"
+
+    def get_system_readiness(self) -> Dict[str, Any]:
+        """Retorna se o sistema está pronto para operar (APIs críticas funcionando)"""
+        if not self.validation_results:
+            self.validate_all_apis()
+
+        summary = self.validation_results['summary']
+        critical_failures = summary['critical_failures']
+        critical_working = sum(
+            1 for api in self.validation_results['apis'].values()
+            if api['priority'] == CRITICAL and api['working']
+        )
+
+        return {
+            'ready': not critical_failures,
+            'critical_failures': critical_failures,
+            'critical_working': critical_working,
+            'working_apis': summary['working'],
+            'total_apis': summary['total'],
+            'last_validation': self.validation_results['timestamp']
+        }
+
+# Sondas registradas (ordem = ordem do relatório)
+PROBES: Tuple[APIProbe, ...] = (
+    APIProbe(
+        'supabase', CRITICAL, ('SUPABASE_URL', 'SUPABASE_ANON_KEY'), 'http_head',
+        url='{SUPABASE_URL}/rest/v1/analyses',
+        build_request=lambda env: {
+            'params': {'select': 'id', 'limit': 1},
+            'headers': {'apikey': env['SUPABASE_ANON_KEY'], 'Authorization': f"Bearer {env['SUPABASE_ANON_KEY']}"}
+        },
+        ok_statuses=(200, 206)
+    ),
+    APIProbe(
+        'gemini', CRITICAL, ('GEMINI_API_KEY',), 'sdk',
+        check=APIValidator._check_gemini, library='google-generativeai', library_available=HAS_GEMINI
+    ),
+    APIProbe(
+        'groq', RECOMMENDED, ('GROQ_API_KEY',), 'sdk',
+        check=APIValidator._check_groq, library='groq', library_available=HAS_GROQ
+    ),
+    APIProbe(
+        'openai', OPTIONAL, ('OPENAI_API_KEY',), 'sdk',
+        check=APIValidator._check_openai, library='openai', library_available=HAS_OPENAI
+    ),
+    APIProbe(
+        'google_search', RECOMMENDED, ('GOOGLE_SEARCH_KEY', 'GOOGLE_CSE_ID'), 'http_get',
+        url='https://www.googleapis.com/customsearch/v1',
+        build_request=lambda env: {'params': {
+            'key': env['GOOGLE_SEARCH_KEY'], 'cx': env['GOOGLE_CSE_ID'], 'q': 'teste', 'num': 1
+        }},
+        success_predicate=lambda response: 'items' in response.json()
+    ),
+    APIProbe(
+        'serper', OPTIONAL, ('SERPER_API_KEY',), 'http_post',
+        url='https://google.serper.dev/search',
+        build_request=lambda env: {
+            'headers': {'X-API-KEY': env['SERPER_API_KEY'], 'Content-Type': 'application/json'},
+            'json': {'q': 'teste', 'num': 1}
+        },
+        success_predicate=lambda response: 'organic' in response.json()
+    ),
+    APIProbe(
+        'jina', OPTIONAL, ('JINA_API_KEY',), 'http_get',
+        url='https://r.jina.ai/https://example.com',
+        build_request=lambda env: {'headers': {'Authorization': f"Bearer {env['JINA_API_KEY']}"}},
+        success_predicate=lambda response: len(response.content) > 100  # bytes, sem decodificar o HTML
+    )
+)
+
+# Instância global (criada no primeiro uso)
+@functools.lru_cache(maxsize=1)
+def get_api_validator() -> APIValidator:
+    """Retorna o validador de APIs compartilhado"""
+    return APIValidator()
+
+# Função de conveniência
+def validate_system_apis() -> Dict[str, Any]:
+    """Valida APIs e retorna prontidão do sistema"""
+    api_validator = get_api_validator()
+    api_validator.validate_all_apis()
+    return api_validator.get_system_readiness()
@@ -6,6 +6,7 @@ Análise inteligente de documentos e arquivos
 """
 
 import os
+import hashlib
 import logging
 import mimetypes
 import re
@@ -27,6 +28,9 @@ class AttachmentService:
         self.upload_folder = os.path.join(os.path.dirname(__file__), '..', 'uploads')
         os.makedirs(self.upload_folder, exist_ok=True)
 
+        # Tamanho dos blocos de gravação do upload (memória O(chunk) por arquivo)
+        self.chunk_size = 64 * 1024
+
         # Tipos de arquivo suportados
         self.supported_types = {
             'application/pdf': 'pdf',
@@ -85,12 +89,13 @@ class AttachmentService:
                 }
 
             # Salva arquivo temporariamente
-            file_path = self._save_temp_file(file, session_id)
-            if not file_path:
+            saved_file = self._save_temp_file(file, session_id)
+            if not saved_file:
                 return {
                     'success': False,
                     'error': 'Erro ao salvar arquivo'
                 }
+            file_path, file_sha256, upload_size = saved_file
 
             # Extrai conteúdo
             content = self._extract_content(file_path, mime_type)
@@ -119,6 +124,8 @@ class AttachmentService:
                 'full_content': processed_content,
                 'metadata': {
                     'file_size': len(content),
+                    'upload_size': upload_size,
+                    'sha256': file_sha256,
                     'mime_type': mime_type,
                     'processed_at': datetime.now().isoformat()
                 }
@@ -131,18 +138,28 @@ class AttachmentService:
                 'error': f'Erro interno: {str(e)}'
             }
 
-    def _save_temp_file(self, file: FileStorage, session_id: str) -> Optional[str]:
-        """Salva arquivo temporariamente"""
+    def _save_temp_file(self, file: FileStorage, session_id: str) -> Optional[Tuple[str, str, int]]:
+        """Salva arquivo temporariamente em blocos; retorna (caminho, sha256, bytes gravados)"""
         try:
             # Gera nome único
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"{session_id}_{timestamp}_{file.filename}"
             file_path = os.path.join(self.upload_folder, filename)
 
-            # Salva arquivo
-            file.save(file_path)
+            # Grava o stream em blocos, calculando o hash incrementalmente
+            stream = file.stream
+            if stream.seekable():
+                stream.seek(0)
+
+            digest = hashlib.sha256()
+            total_bytes = 0
+            with open(file_path, 'wb') as output:
+                for chunk in iter(lambda: stream.read(self.chunk_size), b''):
+                    digest.update(chunk)
+                    output.write(chunk)
+                    total_bytes += len(chunk)
 
-            return file_path
+            return file_path, digest.hexdigest(), total_bytes
 
         except Exception as e:
             logger.error(f"Erro ao salvar arquivo: {str(e)}")
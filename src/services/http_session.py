@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - HTTP Session
+Sessão HTTP compartilhada com pool de conexões keep-alive
+"""
+
+import os
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Adapter compartilhado: um único pool de conexões para todos os serviços
+HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=int(os.getenv('HTTP_POOL_CONNECTIONS', 64)),
+    pool_maxsize=int(os.getenv('HTTP_POOL_MAXSIZE', 256)),
+    max_retries=Retry(total=2, backoff_factor=0.3)
+)
+
+def mount_shared_adapter(session: requests.Session) -> requests.Session:
+    """Monta o adapter compartilhado em uma sessão (mantém headers próprios da sessão)"""
+    session.mount('https://', HTTP_ADAPTER)
+    session.mount('http://', HTTP_ADAPTER)
+    return session
+
+# Instância global
+SESSION = mount_shared_adapter(requests.Session())
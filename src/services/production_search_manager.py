@@ -7,13 +7,13 @@ Gerenciador de busca para produção com múltiplos provedores e fallbacks
 
 import os
 import logging
-import time
-import requests
 from typing import Dict, List, Optional, Any
 from urllib.parse import quote_plus
 from bs4 import BeautifulSoup
 import json
 import random
+from services.search_cache import search_cache, normalize_query
+from services.http_session import SESSION
 
 logger = logging.getLogger(__name__)
 
@@ -65,8 +65,7 @@ class ProductionSearchManager:
             'Connection': 'keep-alive'
         }
         
-        self.cache = {}
-        self.cache_ttl = 3600  # 1 hora
+        self.cache = search_cache
         
         enabled_count = sum(1 for p in self.providers.values() if p['enabled'])
         logger.info(f"Production Search Manager inicializado com {enabled_count} provedores")
@@ -75,12 +74,11 @@ class ProductionSearchManager:
         """Realiza busca com sistema de fallback automático"""
         
         # Verifica cache primeiro
-        cache_key = f"{query}_{max_results}"
-        if cache_key in self.cache:
-            cache_data = self.cache[cache_key]
-            if time.time() - cache_data['timestamp'] < self.cache_ttl:
-                logger.info(f"🔄 Resultado do cache para: {query}")
-                return cache_data['results']
+        cache_key = (normalize_query(query), max_results)
+        cached_results = self.cache.get(cache_key)
+        if cached_results is not None:
+            logger.info(f"🔄 Resultado do cache para: {query}")
+            return cached_results
         
         # Busca com fallback
         for provider_name in self._get_provider_order():
@@ -103,11 +101,7 @@ class ProductionSearchManager:
                 
                 if results:
                     # Cache resultado
-                    self.cache[cache_key] = {
-                        'results': results,
-                        'timestamp': time.time(),
-                        'provider': provider_name
-                    }
+                    self.cache.set(cache_key, results)
                     
                     logger.info(f"✅ {provider_name}: {len(results)} resultados")
                     return results
@@ -162,7 +156,7 @@ class ProductionSearchManager:
             'safe': 'off'
         }
         
-        response = requests.get(
+        response = SESSION.get(
             provider['base_url'],
             params=params,
             headers=self.headers,
@@ -202,7 +196,7 @@ class ProductionSearchManager:
             'num': max_results
         }
         
-        response = requests.post(
+        response = SESSION.post(
             provider['base_url'],
             json=payload,
             headers=headers,
@@ -229,7 +223,7 @@ class ProductionSearchManager:
         """Busca usando Bing (scraping)"""
         search_url = f"{self.providers['bing']['base_url']}?q={quote_plus(query)}&cc=br&setlang=pt-br&count={max_results}"
         
-        response = requests.get(search_url, headers=self.headers, timeout=15)
+        response = SESSION.get(search_url, headers=self.headers, timeout=15)
         
         if response.status_code == 200:
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -264,7 +258,7 @@ class ProductionSearchManager:
         """Busca usando DuckDuckGo (scraping)"""
         search_url = f"{self.providers['duckduckgo']['base_url']}?q={quote_plus(query)}"
         
-        response = requests.get(search_url, headers=self.headers, timeout=15)
+        response = SESSION.get(search_url, headers=self.headers, timeout=15)
         
         if response.status_code == 200:
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -321,7 +315,7 @@ class ProductionSearchManager:
     
     def clear_cache(self):
         """Limpa cache de busca"""
-        self.cache = {}
+        self.cache.clear()
         logger.info("🧹 Cache de busca limpo")
     
     def test_provider(self, provider_name: str) -> bool:
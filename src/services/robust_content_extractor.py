@@ -57,6 +57,7 @@ except ImportError:
     HAS_PDFPLUMBER = False
 
 from services.url_resolver import url_resolver
+from services.http_session import mount_shared_adapter
 
 logger = logging.getLogger(__name__)
 
@@ -64,7 +65,7 @@ class RobustContentExtractor:
     """Extrator de conteúdo multicamadas e robusto com suporte aprimorado a PDF"""
     
     def __init__(self):
-        self.session = requests.Session()
+        self.session = mount_shared_adapter(requests.Session())
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -896,12 +897,8 @@ class RobustContentExtractor:
         return result
     
     def clear_cache(self):
-        """Limpa cache de sessão"""
-        self.session.close()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        """Limpa cache de sessão (cookies); não fecha a sessão, cujo adapter é compartilhado"""
+        self.session.cookies.clear()
         logger.info("🧹 Cache de extração limpo")
 
 # Instância global
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Search Cache
+Cache LRU com expiração para resultados de busca e análises repetidas
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def normalize_query(query: str) -> str:
+    """Normaliza texto de busca para uso como chave de cache"""
+    if not query:
+        return ''
+    normalized = unicodedata.normalize('NFKC', str(query)).lower().strip()
+    return _WHITESPACE_RE.sub(' ', normalized)
+
+def analysis_cache_key(data: Dict[str, Any]) -> tuple:
+    """Gera chave de cache para análise simples (segmento, produto, público + demais campos)"""
+    required = tuple(normalize_query(data.get(field, '')) for field in ('segmento', 'produto', 'publico'))
+    extras = {k: v for k, v in data.items() if k not in ('segmento', 'produto', 'publico')}
+    return required + (json.dumps(extras, sort_keys=True, ensure_ascii=False, default=str),)
+
+class SearchCache:
+    """Cache LRU thread-safe com TTL por entrada"""
+
+    def __init__(self, maxsize: int = 10000, ttl: int = 3600):
+        """Inicializa o cache"""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retorna valor em cache ou None se ausente/expirado"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Armazena valor no cache, removendo o mais antigo se cheio"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Limpa todas as entradas"""
+        with self._lock:
+            self._data.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas de uso do cache"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total) if total else 0.0
+        }
+
+# Instâncias globais
+search_cache = SearchCache(
+    maxsize=int(os.getenv('SEARCH_CACHE_SIZE', 10000)),
+    ttl=int(os.getenv('SEARCH_CACHE_TTL', 3600))
+)
+analysis_cache = SearchCache(
+    maxsize=int(os.getenv('ANALYSIS_CACHE_SIZE', 256)),
+    ttl=int(os.getenv('ANALYSIS_CACHE_TTL', 3600))
+)
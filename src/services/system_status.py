@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - System Status
+Status dos provedores e do banco com cache de curta duração para health checks
+"""
+
+import os
+import time
+import logging
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+from services.ai_manager import ai_manager
+from services.production_search_manager import production_search_manager
+from database import db_manager
+
+logger = logging.getLogger(__name__)
+
+STATUS_CACHE_TTL = float(os.getenv('STATUS_CACHE_TTL', 2))
+STATUS_TIMEOUT = float(os.getenv('STATUS_TIMEOUT', 2))
+STATUS_WORKERS = int(os.getenv('STATUS_WORKERS', 16))
+
+# Pool para executar as verificações de status em paralelo (3 tarefas por requisição)
+status_executor = ThreadPoolExecutor(max_workers=STATUS_WORKERS, thread_name_prefix='status')
+
+# Pool próprio para as estatísticas do banco, que não disputam workers com as sondas
+stats_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='stats')
+
+def ttl_cache(seconds: float) -> Callable:
+    """Memoiza função sem argumentos por `seconds`; rajadas simultâneas compartilham um cálculo"""
+
+    def decorator(func: Callable) -> Callable:
+        lock = threading.Lock()
+        state = {'expires_at': 0.0, 'value': None}
+
+        @functools.wraps(func)
+        def wrapper():
+            if time.monotonic() < state['expires_at']:
+                return state['value']
+            with lock:
+                if time.monotonic() < state['expires_at']:
+                    return state['value']
+                value = func()
+                state['value'] = value
+                state['expires_at'] = time.monotonic() + seconds
+                return value
+
+        def cache_clear():
+            state['expires_at'] = 0.0
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+@ttl_cache(STATUS_CACHE_TTL)
+def get_ai_status() -> Dict[str, Any]:
+    """Status dos provedores de IA (cache curto)"""
+    return ai_manager.get_provider_status()
+
+@ttl_cache(STATUS_CACHE_TTL)
+def get_search_status() -> Dict[str, Any]:
+    """Status dos provedores de busca (cache curto)"""
+    return production_search_manager.get_provider_status()
+
+@ttl_cache(STATUS_CACHE_TTL)
+def get_db_status() -> bool:
+    """Teste de conexão com o banco (cache curto)"""
+    return db_manager.test_connection()
+
+def invalidate_status_cache():
+    """Invalida status em cache (ex.: após reset de provedores)"""
+    get_ai_status.cache_clear()
+    get_search_status.cache_clear()
+    get_db_status.cache_clear()
+
+def collect_system_status(timeout: float = STATUS_TIMEOUT) -> Tuple[Dict[str, Any], Dict[str, Any], bool]:
+    """Obtém status de IA, busca e banco em paralelo (latência = máx, não soma)"""
+    futures = {
+        'ai': (status_executor.submit(get_ai_status), {}),
+        'search': (status_executor.submit(get_search_status), {}),
+        'database': (status_executor.submit(get_db_status), False)
+    }
+    deadline = time.monotonic() + timeout
+    results = {}
+
+    for name, (future, default) in futures.items():
+        try:
+            results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except Exception as e:
+            logger.warning(f"⚠️ Status de {name} indisponível: {e or type(e).__name__}")
+            results[name] = default
+
+    return results['ai'], results['search'], results['database']
+
+
+def collect_system_stats(timeout: float = STATUS_TIMEOUT) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], bool]:
+    """Estatísticas do banco em paralelo com collect_system_status, sob o mesmo prazo"""
+    deadline = time.monotonic() + timeout
+    stats_future = stats_executor.submit(db_manager.get_stats)
+    ai_status, search_status, db_connected = collect_system_status(timeout)
+
+    try:
+        db_stats = stats_future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except Exception as e:
+        logger.warning(f"⚠️ Estatísticas do banco indisponíveis: {e or type(e).__name__}")
+        db_stats = {}
+
+    return db_stats, ai_status, search_status, db_connected
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Task Queue
+Fila de tarefas em background (RQ + Redis) para análises demoradas
+"""
+
+import os
+import logging
+from typing import Any, Dict, Optional
+
+# Import condicional do RQ
+try:
+    from redis import Redis
+    from rq import Queue
+    from rq.exceptions import NoSuchJobError
+    HAS_RQ = True
+except ImportError:
+    HAS_RQ = False
+
+from services.search_cache import SearchCache, analysis_cache, analysis_cache_key
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv('REDIS_URL')
+TASK_QUEUE_NAME = os.getenv('TASK_QUEUE_NAME', 'analysis')
+ANALYSIS_JOB_TIMEOUT = int(os.getenv('ANALYSIS_JOB_TIMEOUT', 600))
+JOB_RESULT_TTL = int(os.getenv('JOB_RESULT_TTL', 3600))
+
+# Status de jobs que ainda podem produzir resultado (job reaproveitável)
+_LIVE_JOB_STATUSES = ('queued', 'started', 'deferred', 'scheduled', 'finished')
+
+def run_analysis_job(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Executa a análise simples no worker (rq worker analysis)"""
+    # O worker não passa por run.py: carrega o .env antes dos serviços que leem chaves ao importar
+    from services.environment_loader import get_environment_loader
+    get_environment_loader()
+
+    from services.enhanced_analysis_engine import enhanced_analysis_engine
+    return enhanced_analysis_engine.generate_complete_analysis(data)
+
+class TaskQueue:
+    """Enfileira análises no RQ; indisponível sem Redis/RQ (execução síncrona)"""
+
+    def __init__(self):
+        """Inicializa a fila se REDIS_URL e rq estiverem disponíveis"""
+        self.queue = None
+        # job_id por chave de análise: pedidos idênticos reaproveitam o job pendente
+        self._jobs = SearchCache(maxsize=int(os.getenv('ANALYSIS_CACHE_SIZE', 256)), ttl=JOB_RESULT_TTL)
+
+        if not HAS_RQ:
+            logger.info("ℹ️ rq não instalado, análises serão executadas de forma síncrona")
+        elif not REDIS_URL:
+            logger.info("ℹ️ REDIS_URL não configurada, análises serão executadas de forma síncrona")
+        else:
+            self.queue = Queue(TASK_QUEUE_NAME, connection=Redis.from_url(REDIS_URL))
+            logger.info(f"✅ Fila de tarefas '{TASK_QUEUE_NAME}' configurada")
+
+    def is_available(self) -> bool:
+        """Verifica se a fila está configurada"""
+        return self.queue is not None
+
+    def enqueue_analysis(self, data: Dict[str, Any]) -> Optional[str]:
+        """Enfileira análise e retorna o job_id (None se a fila falhar)
+
+        Se já existe job vivo (ou concluído) para os mesmos dados, retorna esse job.
+        """
+        if not self.queue:
+            return None
+
+        cache_key = analysis_cache_key(data)
+        job_id = self._jobs.get(cache_key)
+        if job_id:
+            job_status = self.get_job_status(job_id)
+            if job_status and job_status['status'] in _LIVE_JOB_STATUSES:
+                logger.info(f"🔁 Reaproveitando job de análise: {job_id}")
+                return job_id
+
+        try:
+            job = self.queue.enqueue(
+                'services.task_queue.run_analysis_job', data,
+                job_timeout=ANALYSIS_JOB_TIMEOUT,
+                result_ttl=JOB_RESULT_TTL
+            )
+            self._jobs.set(cache_key, job.id)
+            logger.info(f"📥 Análise enfileirada: {job.id}")
+            return job.id
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao enfileirar análise, executando de forma síncrona: {e}")
+            return None
+
+    def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna status (e resultado, se concluído) de um job; None se inexistente"""
+        if not self.queue:
+            return None
+
+        try:
+            job = self.queue.fetch_job(job_id)
+            if job is None:
+                return None
+
+            status = job.get_status(refresh=False)
+            job_status = {
+                'job_id': job.id,
+                'status': status,
+                'enqueued_at': job.enqueued_at.isoformat() if job.enqueued_at else None,
+                'started_at': job.started_at.isoformat() if job.started_at else None,
+                'ended_at': job.ended_at.isoformat() if job.ended_at else None
+            }
+            # result/exc_info podem consultar o Redis (rq >= 1.12)
+            result = job.result if status == 'finished' else None
+            exc_info = job.exc_info if status == 'failed' else None
+        except NoSuchJobError:
+            return None
+        except Exception as e:
+            # Redis indisponível: tratado como job inexistente (o chamador executa de forma síncrona)
+            logger.warning(f"⚠️ Falha ao consultar job {job_id}: {e}")
+            return None
+
+        if status == 'finished':
+            job_status['result'] = result
+            # O worker roda em outro processo: o cache de análises é preenchido aqui
+            if result and job.args:
+                analysis_cache.set(analysis_cache_key(job.args[0]), result)
+        elif status == 'failed':
+            lines = (exc_info or '').strip().splitlines()
+            job_status['error'] = lines[-1] if lines else 'Falha na execução da análise'
+
+        return job_status
+
+# Instância global
+task_queue = TaskQueue()
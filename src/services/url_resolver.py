@@ -12,6 +12,7 @@ import requests
 import json
 from urllib.parse import parse_qs, urlparse, unquote
 from typing import Optional
+from services.http_session import mount_shared_adapter
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +20,7 @@ class URLResolver:
     """Resolvedor robusto de URLs de redirecionamento"""
     
     def __init__(self):
-        self.session = requests.Session()
+        self.session = mount_shared_adapter(requests.Session())
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
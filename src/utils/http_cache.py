@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - HTTP Cache
+ETag e respostas 304 Not Modified para GETs idempotentes
+"""
+
+import os
+import hashlib
+from typing import Any, Dict, Optional
+
+from flask import Response, jsonify, request
+
+from utils.json_provider import dumps_bytes
+from utils.time_utils import now_iso
+
+# Tempo (segundos) que clientes podem reutilizar a resposta sem revalidar
+ETAG_MAX_AGE = int(os.getenv('ETAG_MAX_AGE', 5))
+
+def compute_etag(obj: Any) -> str:
+    """Gera ETag forte a partir do hash blake2b do conteúdo serializado"""
+    return hashlib.blake2b(dumps_bytes(obj), digest_size=16).hexdigest()
+
+def _matching_etag(etag: str) -> Optional[str]:
+    """Tag de If-None-Match que corresponde a `etag`, ou None
+
+    Ignora o sufixo ':br'/':gzip' adicionado pelo Flask-Compress e devolve a tag
+    como o cliente a enviou, para que o 304 repita o ETag recebido no 200.
+    """
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return None
+    if if_none_match.star_tag:
+        return etag
+    for tag in if_none_match.as_set(include_weak=True):
+        if tag.split(':', 1)[0] == etag:
+            return tag
+    return None
+
+def etag_json_response(payload: Dict[str, Any], etag: Optional[str] = None) -> Response:
+    """Resposta JSON com ETag e Cache-Control; 304 se o cliente já tem esta versão
+
+    O 'timestamp' é adicionado ao final e fica fora do hash, para que o ETag
+    só mude quando os dados mudarem.
+    """
+    if etag is None:
+        etag = compute_etag(payload)
+
+    matched = _matching_etag(etag)
+    if matched:
+        # O Flask-Compress não processa 304: o ETag ecoado mantém o sufixo de codificação
+        response = Response(status=304)
+        response.set_etag(matched, weak=request.if_none_match.is_weak(matched))
+    else:
+        response = jsonify({**payload, 'timestamp': now_iso()})
+        response.set_etag(etag)
+
+    response.cache_control.max_age = ETAG_MAX_AGE
+    return response
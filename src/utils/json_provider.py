@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - JSON Provider
+Serialização JSON de alta performance com orjson para o Flask
+"""
+
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+# Import condicional do orjson
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
+def _orjson_default(obj: Any) -> Any:
+    """Converte tipos não suportados nativamente pelo orjson"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider do Flask baseado em orjson (fallback para json padrão)"""
+
+    option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if HAS_ORJSON else 0
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serializa objeto para string JSON"""
+        if not HAS_ORJSON:
+            return super().dumps(obj, **kwargs)
+
+        option = self.option
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(obj, default=_orjson_default, option=option).decode('utf-8')
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Desserializa string JSON"""
+        if not HAS_ORJSON:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serializa objeto diretamente para bytes JSON compactos (UTF-8)"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=_orjson_default, option=OrjsonProvider.option)
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(',', ':'), default=DefaultJSONProvider.default
+    ).encode('utf-8')
+
+if not HAS_ORJSON:
+    logger.warning("⚠️ orjson não instalado, usando serialização JSON padrão")
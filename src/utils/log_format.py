@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Log Formatting
+Formatter de logging com timestamp reaproveitado dentro do mesmo segundo
+"""
+
+import logging
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter que só chama localtime/strftime uma vez por segundo de relógio"""
+
+    def __init__(self, *args, **kwargs):
+        """Inicializa o formatter e o cache do timestamp"""
+        super().__init__(*args, **kwargs)
+        self._last_second = None
+        self._last_formatted = ''
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str = None) -> str:
+        """Formata o horário do registro reutilizando o segundo já formatado"""
+        if datefmt:
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_formatted = super().formatTime(record, self.default_time_format)
+            self._last_second = second
+        return self.default_msec_format % (self._last_formatted, record.msecs)
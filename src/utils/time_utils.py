@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Time Utilities
+Timestamps ISO com cache para respostas de alta frequência
+"""
+
+import time
+from datetime import datetime
+
+# Granularidade do timestamp em cache (segundos)
+ISO_CACHE_INTERVAL = 0.25
+
+_iso_cache = (0.0, '')
+
+def now_iso() -> str:
+    """Retorna datetime.now().isoformat() reaproveitado por até 250ms entre requisições"""
+    global _iso_cache
+    now = time.time()
+    cached_at, value = _iso_cache
+    if abs(now - cached_at) > ISO_CACHE_INTERVAL:
+        value = datetime.fromtimestamp(now).isoformat()
+        _iso_cache = (now, value)
+    return value
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Teste da API HTTP
+Comportamento das rotas de análise via Flask test client (sem servidor nem rede)
+"""
+
+import os
+import sys
+import functools
+
+# Desenvolvimento: sem monkey patch do gevent ao importar run.py
+os.environ.setdefault('FLASK_ENV', 'development')
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+# Limite de corpo usado nos testes (1MB)
+TEST_MAX_CONTENT_LENGTH = 1024 * 1024
+
+@functools.cache
+def _make_app():
+    """App de create_app() registrando apenas o blueprint de análise
+
+    Os demais blueprints importam serviços que não carregam neste ambiente;
+    configuração, handlers de erro, provider JSON e compressão são os de produção.
+    """
+    import run
+    from routes.analysis import analysis_bp
+
+    register_blueprints = run._register_blueprints
+    run._register_blueprints = lambda app: app.register_blueprint(analysis_bp, url_prefix='/api')
+    try:
+        app = run.create_app()
+    finally:
+        run._register_blueprints = register_blueprints
+
+    app.config['MAX_CONTENT_LENGTH'] = TEST_MAX_CONTENT_LENGTH
+    return app
+
+def _client():
+    """Test client da aplicação"""
+    return _make_app().test_client()
+
+def test_oversized_upload_returns_413():
+    """Upload acima do limite responde 413 pelo handler da aplicação, não 500 da rota"""
+    import io
+
+    response = _client().post('/api/upload_attachment', data={
+        'file': (io.BytesIO(b'x' * (2 * TEST_MAX_CONTENT_LENGTH)), 'grande.txt')
+    }, content_type='multipart/form-data')
+
+    assert response.status_code == 413, (response.status_code, response.data[:200])
+    assert response.get_json() == {'error': 'Arquivo excede o tamanho máximo permitido'}
+
+def test_oversized_json_body_returns_413():
+    """Corpo JSON acima do limite responde 413 nas rotas que usam _decode_body"""
+    response = _client().post(
+        '/api/test_search', data=b'{"query": "' + b'x' * (2 * TEST_MAX_CONTENT_LENGTH) + b'"}',
+        content_type='application/json'
+    )
+
+    assert response.status_code == 413, (response.status_code, response.data[:200])
+
+def test_etag_304_round_trip():
+    """If-None-Match com o ETag do 200 (com sufixo de compressão) gera 304 com o mesmo ETag"""
+    client = _client()
+
+    first = client.get('/api/stats', headers={'Accept-Encoding': 'br, gzip'})
+    assert first.status_code == 200, first.status_code
+    etag = first.headers['ETag']
+
+    for headers in ({'Accept-Encoding': 'br, gzip'}, {}):
+        second = client.get('/api/stats', headers={**headers, 'If-None-Match': etag})
+        assert second.status_code == 304, (headers, second.status_code)
+        assert second.headers['ETag'] == etag, (etag, second.headers['ETag'])
+        assert second.data == b''
+
+    stale = client.get('/api/stats', headers={'If-None-Match': '"outro-etag"'})
+    assert stale.status_code == 200, stale.status_code
+
+def test_orjson_provider_output():
+    """jsonify usa o OrjsonProvider: JSON compacto, UTF-8 sem escapes, ordem de inserção e tipos extras"""
+    from datetime import datetime
+    from decimal import Decimal
+    from flask import jsonify
+    from utils.json_provider import dumps_bytes
+
+    payload = {'título': 'Análise', 'quando': datetime(2024, 1, 2, 3, 4, 5), 'preço': Decimal('9.90'), 1: {'a'}}
+
+    with _make_app().app_context():
+        body = jsonify(payload).get_data()
+
+    # O Flask encerra o corpo de jsonify com uma quebra de linha
+    expected = '{"título":"Análise","quando":"2024-01-02T03:04:05","preço":"9.90","1":["a"]}'.encode('utf-8')
+    assert body == expected + b'\n', body
+    assert dumps_bytes(payload) == expected
+
+def test_schema_rejections_return_400():
+    """Corpo malformado ou fora do schema responde 400 antes de qualquer trabalho"""
+    client = _client()
+    cases = [
+        ('/api/analyze_simple', b'{"segmento": "Fitness", "produto": "App"}', 'Campos obrigatórios: publico'),
+        ('/api/analyze_simple', b'{"segmento": "", "produto": "App", "publico": "Adultos"}', 'Campos obrigatórios: segmento'),
+        ('/api/analyze_simple', b'[]', 'Dados inválidos'),
+        ('/api/test_search', b'{bad', 'Dados inválidos'),
+        ('/api/test_search', b'{"max_results": "muitos"}', 'Dados inválidos'),
+        ('/api/test_ai', b'{"prompt": 42}', 'Dados inválidos')
+    ]
+
+    for url, body, error in cases:
+        response = client.post(url, data=body, content_type='application/json')
+        assert response.status_code == 400, (url, body, response.status_code)
+        assert response.get_json()['error'] == error, (url, body, response.get_json())
+
+def test_test_search_schema_coerces_strings():
+    """TestSearchRequest usa strict=False: números enviados como string são aceitos; corpo vazio usa os padrões"""
+    from routes.analysis import _decode_body, _test_search_decoder
+
+    app = _make_app()
+    with app.test_request_context('/api/test_search', method='POST', data=b'{"max_results": "3"}'):
+        data, error = _decode_body(_test_search_decoder)
+    assert error is None
+    assert data.max_results == 3
+
+    with app.test_request_context('/api/test_search', method='POST', data=b''):
+        data, error = _decode_body(_test_search_decoder)
+    assert error is None
+    assert (data.query, data.max_results) == ('teste mercado digital Brasil', 5)
+
+def test_app_status_document():
+    """app_status com prefixo pré-codificado é um documento JSON válido e completo"""
+    import run
+
+    response = _client().get('/api/app_status')
+    assert response.status_code == 200, response.status_code
+    assert response.mimetype == 'application/json'
+
+    status = response.get_json()
+    assert list(status) == ['status', 'version', 'timestamp', 'services'], list(status)
+    assert (status['status'], status['version']) == ('healthy', run.APP_VERSION)
+    assert set(status['services']) == {'ai_providers', 'search_providers', 'database'}
+
+def test_preencoded_error_bodies():
+    """404 usa o corpo de erro pré-codificado da aplicação"""
+    response = _client().get('/api/nao-existe')
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Endpoint não encontrado'}
+
+def test_large_json_is_compressed():
+    """JSON acima de COMPRESS_MIN_SIZE sai em brotli/gzip; respostas pequenas e NDJSON não são comprimidas"""
+    import gzip
+    import json
+    import brotli
+
+    client = _client()
+    plain = client.get('/api/stats')
+    assert plain.headers.get('Content-Encoding') is None
+    assert len(plain.data) >= _make_app().config['COMPRESS_MIN_SIZE'], len(plain.data)
+
+    for accept, encoding, decompress in (('br, gzip', 'br', brotli.decompress), ('gzip', 'gzip', gzip.decompress)):
+        response = client.get('/api/stats', headers={'Accept-Encoding': accept})
+        assert response.headers.get('Content-Encoding') == encoding, (accept, response.headers)
+        assert 'Accept-Encoding' in response.headers.get('Vary', '')
+        assert set(json.loads(decompress(response.data))) == set(plain.get_json())
+
+    small = client.get('/api/nao-existe', headers={'Accept-Encoding': 'br, gzip'})
+    assert small.headers.get('Content-Encoding') is None
+
+    stream = client.get('/api/list_analyses?stream=1', headers={'Accept-Encoding': 'br, gzip'})
+    assert stream.is_streamed and stream.headers.get('Content-Encoding') is None
+
+def run_all_tests():
+    """Executa todos os testes"""
+    print("=" * 50)
+    print("🚀 ARQV30 Enhanced v2.0 - Teste da API HTTP")
+    print("=" * 50)
+
+    tests = [
+        ("Upload acima do limite", test_oversized_upload_returns_413),
+        ("JSON acima do limite", test_oversized_json_body_returns_413),
+        ("ETag 304 ida e volta", test_etag_304_round_trip),
+        ("Saída do OrjsonProvider", test_orjson_provider_output),
+        ("Schemas rejeitam com 400", test_schema_rejections_return_400),
+        ("strict=False converte strings", test_test_search_schema_coerces_strings),
+        ("Documento de app_status", test_app_status_document),
+        ("Corpos de erro pré-codificados", test_preencoded_error_bodies),
+        ("Compressão de JSON grande", test_large_json_is_compressed)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"{test_name:.<40} ✅ PASSOU")
+            passed += 1
+        except Exception as e:
+            print(f"{test_name:.<40} ❌ FALHOU: {str(e)}")
+
+    print("-" * 50)
+    print(f"Total: {passed}/{len(tests)} testes passaram")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
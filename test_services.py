@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Teste dos Serviços
+Caches e instâncias compartilhadas dos serviços (sem rede)
+"""
+
+import os
+import sys
+import time
+import threading
+import subprocess
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+def _counting(func=None):
+    """Função sem argumentos que conta as chamadas (retorna o número da chamada)"""
+    calls = []
+
+    def counted():
+        if func:
+            func()
+        calls.append(None)
+        return len(calls)
+
+    return counted, calls
+
+def test_ttl_cache_expiry():
+    """ttl_cache reutiliza o valor dentro do TTL e recalcula depois que expira"""
+    from services.system_status import ttl_cache
+
+    counted, calls = _counting()
+    cached = ttl_cache(0.05)(counted)
+
+    assert cached() == 1
+    assert cached() == 1
+    time.sleep(0.06)
+    assert cached() == 2
+    assert len(calls) == 2
+
+def test_ttl_cache_clear():
+    """cache_clear força novo cálculo na próxima chamada"""
+    from services.system_status import ttl_cache
+
+    counted, calls = _counting()
+    cached = ttl_cache(60)(counted)
+
+    assert cached() == 1
+    cached.cache_clear()
+    assert cached() == 2
+    assert cached() == 2
+
+def test_ttl_cache_shares_concurrent_calls():
+    """Rajada simultânea com cache frio executa a função uma única vez"""
+    from services.system_status import ttl_cache
+
+    counted, calls = _counting(lambda: time.sleep(0.05))
+    cached = ttl_cache(60)(counted)
+
+    threads = [threading.Thread(target=cached) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1, len(calls)
+
+def _run_isolated(code: str) -> str:
+    """Executa `code` em um interpretador novo (estado de import limpo) e retorna o stdout"""
+    src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=src_dir, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr[-500:]
+    return result.stdout.strip()
+
+def test_environment_loader_factory():
+    """Importar o módulo não cria o carregador; a fábrica devolve sempre a mesma instância"""
+    output = _run_isolated(
+        "from services import environment_loader as m\n"
+        "print(m.get_environment_loader.cache_info().currsize)\n"
+        "loader = m.get_environment_loader()\n"
+        "m.ensure_environment_loaded()\n"
+        "print(m.get_environment_loader() is loader, m.get_environment_loader.cache_info().misses)"
+    )
+    assert output.splitlines() == ['0', 'True 1'], output
+
+def test_api_validator_factory():
+    """Importar o módulo não cria o validador; get_api_validator devolve sempre a mesma instância"""
+    output = _run_isolated(
+        "from services import api_validator as m\n"
+        "print(m.get_api_validator.cache_info().currsize)\n"
+        "print(m.get_api_validator() is m.get_api_validator(), m.get_api_validator.cache_info().misses)"
+    )
+    assert output.splitlines() == ['0', 'True 1'], output
+
+def run_all_tests():
+    """Executa todos os testes"""
+    print("=" * 50)
+    print("🚀 ARQV30 Enhanced v2.0 - Teste dos Serviços")
+    print("=" * 50)
+
+    tests = [
+        ("TTL expira", test_ttl_cache_expiry),
+        ("cache_clear invalida", test_ttl_cache_clear),
+        ("Rajada compartilha cálculo", test_ttl_cache_shares_concurrent_calls),
+        ("Fábrica do carregador de ambiente", test_environment_loader_factory),
+        ("Fábrica do validador de APIs", test_api_validator_factory)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"{test_name:.<40} ✅ PASSOU")
+            passed += 1
+        except Exception as e:
+            print(f"{test_name:.<40} ❌ FALHOU: {str(e)}")
+
+    print("-" * 50)
+    print(f"Total: {passed}/{len(tests)} testes passaram")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
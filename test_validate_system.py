@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - Teste do Validador do Sistema
+Verifica que validate_system.py --json carrega o .env antes das sondas
+"""
+
+import io
+import os
+import sys
+import json
+import tempfile
+import contextlib
+
+# Adiciona o diretório raiz (validate_system) ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Chaves escritas no .env temporário (Supabase em endereço local, recusado na hora;
+# o cliente do Gemini é substituído no teste: nenhuma sonda sai para a rede)
+ENV_KEYS = {
+    'SUPABASE_URL': 'http://127.0.0.1:9',
+    'SUPABASE_ANON_KEY': 'test-anon-key',
+    'GEMINI_API_KEY': 'test-gemini-key'
+}
+
+class _OfflineModelClient:
+    """Cliente de modelos do Gemini sem rede (lista vazia)"""
+
+    def list_models(self, **kwargs):
+        return iter(())
+
+def test_json_mode_loads_env():
+    """main(['--json']) deve carregar o .env: as chaves aparecem como configuradas"""
+    import validate_system
+    from services import api_validator
+    from services.environment_loader import get_environment_loader
+
+    original_cwd = os.getcwd()
+    original_env = {key: os.environ.pop(key, None) for key in ENV_KEYS}
+    default_model_client = getattr(api_validator, 'get_default_model_client', None)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with open(os.path.join(tmp_dir, '.env'), 'w', encoding='utf-8') as f:
+            f.writelines(f"{key}={value}\n" for key, value in ENV_KEYS.items())
+
+        try:
+            # .env do diretório atual tem prioridade na busca do carregador
+            os.chdir(tmp_dir)
+            get_environment_loader.cache_clear()
+            api_validator.get_default_model_client = _OfflineModelClient
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                validate_system.main(['--json', '--no-cache'])
+        finally:
+            os.chdir(original_cwd)
+            get_environment_loader.cache_clear()
+            api_validator.get_default_model_client = default_model_client
+            for key, value in original_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    lines = output.getvalue().splitlines()
+    assert len(lines) == 1, f"Esperada uma única linha JSON, obtido: {lines}"
+
+    summary = json.loads(lines[0])
+    assert summary['apis']['supabase']['configured'], summary['apis']['supabase']
+    assert summary['apis']['gemini']['configured'], summary['apis']['gemini']
+    # Resposta do cliente substituído: a sonda do Gemini não saiu para a rede
+    assert summary['apis']['gemini']['details'] == "Nenhum modelo disponível", summary['apis']['gemini']
+
+def test_probe_error_skips_revalidation():
+    """Erro na validação (ex.: cache corrompido) gera prontidão do erro, sem revalidar fora do prazo"""
+    import validate_system
+    from services.api_validator import APIValidator, get_api_validator
+
+    # Sem resultados anteriores: get_system_readiness() revalidaria as APIs
+    get_api_validator().validation_results = {}
+
+    def corrupt_cache(*args, **kwargs):
+        raise AttributeError("'list' object has no attribute 'get'")
+
+    def revalidate(*args, **kwargs):
+        raise AssertionError("validate_all_apis chamado na thread principal")
+
+    cached_validate = validate_system._cached_validate
+    validate_all_apis = APIValidator.validate_all_apis
+    validate_system._cached_validate = corrupt_cache
+    APIValidator.validate_all_apis = revalidate
+    try:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            ready = validate_system.main(['--json'])
+    finally:
+        validate_system._cached_validate = cached_validate
+        APIValidator.validate_all_apis = validate_all_apis
+
+    summary = json.loads(output.getvalue())
+    assert ready is False
+    assert summary['readiness']['critical_working'] == 0, summary['readiness']
+    assert not summary['components']['APIs externas']['ok'], summary['components']
+
+def test_corrupt_cache_entry_is_ignored():
+    """Entrada de cache com JSON válido mas formato inesperado equivale a cache vazio"""
+    import validate_system
+
+    cache_file = validate_system.CACHE_FILE
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        validate_system.CACHE_FILE = os.path.join(tmp_dir, 'api_validation.json')
+        try:
+            for content in ('[1, 2]', '{"key": "k"}', '{"key": "k", "results": [], "ts": 0}'):
+                with open(validate_system.CACHE_FILE, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                assert validate_system._load_cached_validation('k') is None, content
+        finally:
+            validate_system.CACHE_FILE = cache_file
+
+def run_all_tests():
+    """Executa todos os testes"""
+    print("=" * 50)
+    print("🚀 ARQV30 Enhanced v2.0 - Teste do Validador")
+    print("=" * 50)
+
+    tests = [
+        ("--json carrega o .env", test_json_mode_loads_env),
+        ("Erro não revalida", test_probe_error_skips_revalidation),
+        ("Cache corrompido ignorado", test_corrupt_cache_entry_is_ignored)
+    ]
+
+    passed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"{test_name:.<30} ✅ PASSOU")
+            passed += 1
+        except Exception as e:
+            print(f"{test_name:.<30} ❌ FALHOU: {str(e)}")
+
+    print("-" * 50)
+    print(f"Total: {passed}/{len(tests)} testes passaram")
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
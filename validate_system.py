@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ARQV30 Enhanced v2.0 - System Validator
+Valida ambiente, APIs externas e componentes principais antes de iniciar
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import functools
+import argparse
+import logging
+import importlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+
+# Adiciona src ao path (caminho absoluto, uma única vez)
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_SRC = os.path.join(_HERE, 'src')
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+# Configuração de logging (apenas avisos: o relatório é impresso no stdout)
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+# Cache em disco da validação de APIs (reexecuções seguidas não refazem as sondas)
+CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'arqv30', 'api_validation.json')
+CACHE_VERSION = 1
+CRITICAL_CACHE_TTL = int(os.getenv('VALIDATION_CRITICAL_CACHE_TTL', 10))
+RECOMMENDED_CACHE_TTL = int(os.getenv('VALIDATION_RECOMMENDED_CACHE_TTL', 60))
+
+# Prazo (segundos) por componente; cobre o pior caso connect+read das sondas HTTP (2+8)
+COMPONENT_TIMEOUT = float(os.getenv('VALIDATION_COMPONENT_TIMEOUT', 10))
+
+def _cache_key():
+    """Hash das variáveis usadas pelas sondas: mudar qualquer chave invalida o cache"""
+    from services.api_validator import PROBES
+
+    env_keys = sorted({key for probe in PROBES for key in probe.env_keys})
+    material = json.dumps([CACHE_VERSION, [(key, os.getenv(key, '')) for key in env_keys]])
+    return hashlib.blake2b(material.encode('utf-8'), digest_size=16).hexdigest()
+
+def _load_cached_validation(key):
+    """Retorna (timestamp, resultados) do cache se a chave bater e o TTL não expirou"""
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # Entrada corrompida (JSON válido com outro formato) equivale a cache vazio
+    try:
+        if stored.get('key') != key:
+            return None
+
+        # Com API crítica falhando o usuário provavelmente está corrigindo a config: TTL curto
+        results = stored['results']
+        ttl = CRITICAL_CACHE_TTL if results['summary']['critical_failures'] else RECOMMENDED_CACHE_TTL
+        if time.time() - stored['ts'] >= ttl:
+            return None
+    except (AttributeError, KeyError, TypeError):
+        return None
+    return stored['ts'], results
+
+def _store_cached_validation(key, results):
+    """Grava o cache de forma atômica (arquivo temporário + os.replace)"""
+    try:
+        cache_dir = os.path.dirname(CACHE_FILE)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'ts': time.time(), 'results': results}, f)
+        os.replace(tmp_path, CACHE_FILE)
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"⚠️ Não foi possível gravar o cache de validação: {e}")
+
+def _cached_validate(api_validator, use_cache=True, executor=None, session=None):
+    """validate_all_apis() com cache-aside em disco"""
+    if not use_cache:
+        return api_validator.validate_all_apis(executor=executor, session=session)
+
+    key = _cache_key()
+    cached = _load_cached_validation(key)
+    if cached:
+        api_validator.last_validation, api_validator.validation_results = cached
+        return api_validator.validation_results
+
+    results = api_validator.validate_all_apis(executor=executor, session=session)
+    _store_cached_validation(key, results)
+    return results
+
+@functools.lru_cache(maxsize=1)
+def _env_status(mtime_ns):
+    """Status formatado do ambiente; o .env é recarregado e o status recalculado só quando o mtime muda"""
+    from services.environment_loader import get_environment_loader
+
+    environment_loader = get_environment_loader()
+    if environment_loader.env_mtime_ns != mtime_ns:
+        environment_loader.load_environment()
+    return environment_loader.format_configuration_status()
+
+def _print_env_status():
+    """Imprime o status do ambiente (mtime 0 quando não há .env)"""
+    from services.environment_loader import find_env_file
+
+    env_file = find_env_file()
+    print(_env_status(env_file.stat().st_mtime_ns if env_file else 0))
+
+def _build_session():
+    """Sessão HTTP única das sondas: keep-alive e sem retries (adapter das sondas do validador)"""
+    from services.api_validator import build_probe_session
+
+    session = build_probe_session()
+    session.headers.update({'User-Agent': 'ARQV30-SystemValidator/2.0', 'Connection': 'keep-alive'})
+    return session
+
+def _probe_apis(api_validator, use_cache=True, executor=None, session=None):
+    """Valida as APIs externas (sondas em paralelo no executor informado)
+
+    Retorna (componente, prontidão); em erro a prontidão vem do próprio erro, sem
+    revalidar as APIs fora do prazo.
+    """
+    try:
+        validation_results = _cached_validate(api_validator, use_cache, executor, session)
+        summary = validation_results['summary']
+        component = {
+            'name': 'APIs externas',
+            'ok': not summary['critical_failures'],
+            'detail': f"{summary['working']}/{summary['total']} funcionando"
+        }
+        return component, api_validator.get_system_readiness()
+    except Exception as e:
+        return {'name': 'APIs externas', 'ok': False, 'detail': f"Erro: {e}"}, _unavailable_readiness()
+
+def _unavailable_readiness():
+    """Prontidão quando a validação de APIs não terminou (erro ou timeout)"""
+    from services.api_validator import PROBES
+
+    return {
+        'ready': False, 'critical_failures': [], 'critical_working': 0,
+        'working_apis': 0, 'total_apis': len(PROBES)
+    }
+
+def _provider_component(name, status):
+    """Componente a partir do status dos provedores (ok se algum disponível, nomes no detalhe)"""
+    up = [provider for provider, p in status.items() if p['available']]
+    return {'name': name, 'ok': bool(up), 'detail': f"{len(up)} provedores disponíveis ({', '.join(up) or 'nenhum'})"}
+
+def _probe_ai():
+    """Verifica provedores de IA (importa o AI Manager apenas aqui)"""
+    try:
+        ai_manager = importlib.import_module('services.ai_manager').ai_manager
+        return _provider_component('AI Manager', ai_manager.get_provider_status())
+    except Exception as e:
+        return {'name': 'AI Manager', 'ok': False, 'detail': f"Erro: {e}"}
+
+def _probe_search():
+    """Verifica provedores de busca (importa o Search Manager apenas aqui)"""
+    try:
+        production_search_manager = importlib.import_module('services.production_search_manager').production_search_manager
+        return _provider_component('Search Manager', production_search_manager.get_provider_status())
+    except Exception as e:
+        return {'name': 'Search Manager', 'ok': False, 'detail': f"Erro: {e}"}
+
+def _probe_db():
+    """Testa a conexão com o banco (importa database apenas aqui)"""
+    try:
+        db_manager = importlib.import_module('database').db_manager
+        connected = db_manager.test_connection()
+        return {'name': 'Database', 'ok': connected, 'detail': "Conexão OK" if connected else "Sem conexão"}
+    except Exception as e:
+        return {'name': 'Database', 'ok': False, 'detail': f"Erro: {e}"}
+
+def _print_component(component):
+    """Imprime a linha de status de um componente"""
+    status_icon = "✅" if component['ok'] else "❌"
+    print(f"   {status_icon} {component['name']}: {component['detail']}")
+
+def _write_json_summary(readiness, components, api_validator, system_ready):
+    """Emite o resumo da validação como uma única linha JSON (saída para CI)"""
+    summary = {
+        'ready': system_ready,
+        'readiness': readiness,
+        'apis': api_validator.validation_results.get('apis', {}),
+        'components': {
+            component['name']: {'ok': component['ok'], 'detail': component['detail']}
+            for component in components
+        }
+    }
+    sys.stdout.write(json.dumps(summary, separators=(',', ':')) + "\n")
+    sys.stdout.flush()
+
+def _print_report(readiness, components, api_validator, json_output=False):
+    """Imprime o relatório final (ou o resumo JSON) e retorna se o sistema está pronto"""
+    components_ok = sum(1 for component in components if component['ok'])
+    system_ready = readiness['ready'] and components_ok == len(components)
+
+    if json_output:
+        _write_json_summary(readiness, components, api_validator, system_ready)
+        return system_ready
+
+    # Vazio se a validação de APIs estourou o prazo
+    api_results = api_validator.validation_results.get('apis', {})
+
+    # Relatório montado em memória e emitido com uma única escrita no stdout
+    lines = [
+        "\n" + "=" * 80,
+        "📊 RELATÓRIO FINAL",
+        "=" * 80,
+        f"   APIs funcionando: {readiness['working_apis']}/{readiness['total_apis']}",
+        f"   Componentes OK: {components_ok}/{len(components)}"
+    ]
+
+    if system_ready:
+        lines.append("\n✅ SISTEMA PRONTO PARA USO")
+        lines.append("\n📋 PRÓXIMOS PASSOS:")
+        lines.append("   1. Execute: python src/run.py")
+        lines.append("   2. Acesse: http://localhost:5000")
+    else:
+        lines.append("\n❌ SISTEMA NÃO ESTÁ PRONTO")
+
+        critical_missing = [
+            api_name.upper() for api_name, api in api_results.items()
+            if api['priority'] == 'CRITICAL' and not api['working']
+        ]
+
+        if critical_missing:
+            lines.append("\n🚨 APIs críticas com problema:")
+            lines.extend(f"   • {api_name}" for api_name in critical_missing)
+
+        lines.append("\n📋 PRÓXIMOS PASSOS:")
+        lines.append("   1. Configure as variáveis ausentes no arquivo .env")
+        lines.append("   2. Execute novamente: python validate_system.py")
+
+    lines.append("=" * 80)
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+    return system_ready
+
+def main(argv=None):
+    """Executa a validação completa do sistema"""
+    parser = argparse.ArgumentParser(description="Valida ambiente, APIs e componentes do ARQV30")
+    parser.add_argument('--no-cache', action='store_true', help="ignora o cache em disco da validação de APIs")
+    parser.add_argument('--json', action='store_true', help="emite apenas o resumo em uma linha JSON")
+    args = parser.parse_args(argv)
+
+    # Carrega o .env sempre (também com --json): sondas e chave do cache leem as variáveis
+    from services.environment_loader import get_environment_loader
+    get_environment_loader()
+
+    from services.api_validator import get_api_validator, PROBES
+
+    if not args.json:
+        print("=" * 80)
+        print("🔍 ARQV30 Enhanced v2.0 - VALIDAÇÃO DO SISTEMA")
+        print("=" * 80)
+        _print_env_status()
+
+        # Testa componentes principais em paralelo (tempo total = probe mais lenta)
+        print("\n🧪 Testando componentes principais...")
+
+    api_validator = get_api_validator()
+    components = []
+
+    def _add_component(component):
+        components.append(component)
+        if not args.json:
+            _print_component(component)
+
+    # Pool único para sondas de API e componentes; +1 porque _probe_apis ocupa
+    # um worker enquanto espera as sondas que submete no mesmo pool
+    executor = ThreadPoolExecutor(max_workers=len(PROBES) + 1, thread_name_prefix='validate')
+    session = _build_session()
+    api_future = executor.submit(_probe_apis, api_validator, not args.no_cache, executor, session)
+
+    try:
+        try:
+            api_component, readiness = api_future.result(timeout=COMPONENT_TIMEOUT)
+        except FutureTimeoutError:
+            api_component = {'name': 'APIs externas', 'ok': False, 'detail': "timeout"}
+            readiness = _unavailable_readiness()
+        _add_component(api_component)
+
+        # Sem nenhuma API crítica, AI/Search/Database não podem funcionar: nem importa os módulos
+        if readiness['critical_working'] == 0:
+            if not args.json:
+                print("   ⏭️ AI Manager, Search Manager e Database ignorados (nenhuma API crítica funcionando)")
+            return _print_report(readiness, components, api_validator, args.json)
+
+        futures = {
+            executor.submit(_probe_db): 'Database',
+            executor.submit(_probe_ai): 'AI Manager',
+            executor.submit(_probe_search): 'Search Manager'
+        }
+
+        try:
+            for future in as_completed(futures, timeout=COMPONENT_TIMEOUT):
+                _add_component(future.result())
+        except FutureTimeoutError:
+            for future, name in futures.items():
+                if not future.done():
+                    _add_component({'name': name, 'ok': False, 'detail': "timeout"})
+    finally:
+        # Não espera probes travadas: o relatório sai dentro do prazo
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return _print_report(readiness, components, api_validator, args.json)
+
+if __name__ == "__main__":
+    system_ready = main()
+    # Workers do executor não são daemon e seriam aguardados na saída: com uma probe
+    # travada o processo ficaria vivo após o relatório. Encerra direto após o flush.
+    sys.stdout.flush()
+    logging.shutdown()
+    os._exit(0 if system_ready else 1)